@@ -5,95 +5,92 @@ from tkinter import ttk, filedialog, scrolledtext, messagebox
 import threading
 import os
 import time
+import functools
+import atexit
+import asyncio
 from pathlib import Path
 import customtkinter as ctk  # Using customtkinter to create a more attractive UI
 from CTkMessagebox import CTkMessagebox  # More attractive message box
 from PIL import Image, ImageTk  # For handling icons
 
 # Import existing summarization functions
-import pdfplumber
 from docx import Document
-from typing import List
-import subprocess
+from summarizer import MAX_PARALLEL, chunk_sources, close_client, semantic_cache, summarize, warm_up_model
+from summarizer import extract_text as _extract_text_from_file
 
+# Number of extracted documents kept in memory
+EXTRACT_CACHE_SIZE = 8
 
-# —— 1. Text Extraction Functions —— #
+# Progress bar refresh interval (~60 fps)
+ANIMATION_INTERVAL_MS = 16
+# Block size for inserting large texts into a text box
+INSERT_CHUNK_CHARS = 65536
+
+
+# —— Text extraction —— #
 def extract_text(file_path: str) -> str:
-    """Automatically call the appropriate extraction function based on file extension"""
-    if file_path.lower().endswith(".pdf"):
-        return extract_text_from_pdf(file_path)
-    if file_path.lower().endswith(".docx"):
-        return extract_text_from_docx(file_path)
-    # Default to plain text
-    with open(file_path, encoding="utf-8") as f:
-        return f.read()
-
-
-def extract_text_from_pdf(pdf_path: str) -> str:
-    texts = []
-    with pdfplumber.open(pdf_path) as pdf:
-        for page in pdf.pages:
-            texts.append(page.extract_text() or "")
-    return "\n".join(texts)
-
-
-def extract_text_from_docx(docx_path: str) -> str:
-    doc = Document(docx_path)
-    return "\n".join([p.text for p in doc.paragraphs if p.text.strip()])
-
-
-# —— 2. Text Chunking Functions —— #
-def chunk_text(text: str, max_chars: int = 20000) -> List[str]:
-    """Split long text into characters to avoid prompt words that are too long"""
-    paras = text.split("\n")
-    chunks: List[str] = []
-    current = []
-    count = 0
-    for p in paras:
-        l = len(p)
-        if count + l > max_chars and current:
-            chunks.append("\n".join(current))
-            current = [p]
-            count = l
-        else:
-            current.append(p)
-            count += l
-    if current:
-        chunks.append("\n".join(current))
-    return chunks
-
-
-# —— 3. Summarize with Ollama CLI —— #
-def summarize_with_ollama(text: str, model: str) -> str:
-    prompt = (
-        "The following is the summary content：\n"
-        f"{text}\n\n"
-        "Please extract the key points of this passage in English and output a concise summary："
-    )
-    # Call Ollama CLI and specify decoding parameters
-    proc = subprocess.run(
-        ["ollama", "run", model, prompt],
-        stdout=subprocess.PIPE,
-        stderr=subprocess.PIPE,
-        encoding="utf-8",
-        errors="ignore",
-        check=False
-    )
-
-    # Prioritize stdout; if empty, use stderr
-    output = proc.stdout.strip() if proc.stdout else proc.stderr.strip()
-    return output
-
-
-def summarize(text: str, model: str, update_callback=None) -> str:
-    chunks = chunk_text(text)
-    summaries = []
-    for idx, chunk in enumerate(chunks, 1):
-        if update_callback:
-            update_callback(f"Summarizing part {idx}/{len(chunks)}...")
-        s = summarize_with_ollama(chunk, model)
-        summaries.append(s)
-    return "\n\n".join(summaries)
+    """Extract the file's text, reusing the previous result while the file is unchanged on disk"""
+    st = os.stat(file_path)
+    return _extract_text_cached(os.path.abspath(file_path), st.st_mtime_ns, st.st_size)
+
+
+@functools.lru_cache(maxsize=EXTRACT_CACHE_SIZE)
+def _extract_text_cached(file_path: str, mtime_ns: int, size: int) -> str:
+    # mtime_ns and size are only part of the cache key, so an edited file is extracted again
+    return _extract_text_from_file(file_path)
+
+
+# All Ollama requests run on this background event loop: the shared client's pooled connections
+# belong to the loop that opened them, so they must not be reused from a fresh asyncio.run()
+_loop = asyncio.new_event_loop()
+threading.Thread(target=_loop.run_forever, daemon=True).start()
+
+
+def run_async(coro):
+    """Run a coroutine on the background loop and wait for its result"""
+    return asyncio.run_coroutine_threadsafe(coro, _loop).result()
+
+
+def _close_client():
+    asyncio.run_coroutine_threadsafe(close_client(), _loop).result(timeout=5)
+    _loop.call_soon_threadsafe(_loop.stop)
+
+
+atexit.register(_close_client)
+
+
+class ToolTip:
+    """Show a small hint window while the mouse hovers over a widget"""
+
+    def __init__(self, widget, text):
+        self.widget = widget
+        self.text = text
+        self.tip_window = None
+        widget.bind("<Enter>", self.show, add="+")
+        widget.bind("<Leave>", self.hide, add="+")
+
+    def show(self, event=None):
+        if self.tip_window:
+            return
+        x = self.widget.winfo_rootx() + 20
+        y = self.widget.winfo_rooty() + self.widget.winfo_height() + 5
+        self.tip_window = tk.Toplevel(self.widget)
+        self.tip_window.wm_overrideredirect(True)
+        self.tip_window.wm_geometry(f"+{x}+{y}")
+        tk.Label(
+            self.tip_window,
+            text=self.text,
+            justify=tk.LEFT,
+            background="#ffffe0",
+            relief=tk.SOLID,
+            borderwidth=1,
+            wraplength=360
+        ).pack(ipadx=4, ipady=2)
+
+    def hide(self, event=None):
+        if self.tip_window:
+            self.tip_window.destroy()
+            self.tip_window = None
 
 
 # GUI Application Class
@@ -109,10 +106,19 @@ class SummarizationApp(ctk.CTk):
         ctk.set_default_color_theme("blue")  # Default color theme
 
         self.file_path = None
+        self.raw_text = None
+        self._original_loaded = False
         self.summary_result = None
+        self._anim_state = None
+        self._anim_job = None
 
         self.create_widgets()
         self.center_window()
+        self.warm_up_model(self.model_var.get())
+
+    def warm_up_model(self, model):
+        """Preload the selected model in the background so the first chunk does not wait for it"""
+        asyncio.run_coroutine_threadsafe(warm_up_model(model), _loop)
 
     def center_window(self):
         """Center the window on display"""
@@ -187,11 +193,19 @@ class SummarizationApp(ctk.CTk):
             control_frame,
             values=models,
             variable=self.model_var,
+            command=self.warm_up_model,
             width=180,
             height=35,
             font=ctk.CTkFont(size=14)
         )
         self.model_combo.pack(side=tk.LEFT, padx=5, pady=15)
+        ToolTip(
+            self.model_combo,
+            f"Chunks are summarized concurrently, up to {MAX_PARALLEL} at a time.\n"
+            "Server settings (set before starting `ollama serve`):\n"
+            "  OLLAMA_NUM_PARALLEL - requests each model serves in parallel\n"
+            "  OLLAMA_MAX_LOADED_MODELS - models kept in memory at the same time"
+        )
 
         # Summarize button
         self.summarize_button = ctk.CTkButton(
@@ -226,7 +240,7 @@ class SummarizationApp(ctk.CTk):
         self.status_label.pack(side=tk.RIGHT, padx=20, pady=15)
 
         # Create tab control
-        self.tab_view = ctk.CTkTabview(self)
+        self.tab_view = ctk.CTkTabview(self, command=self._on_tab_changed)
         self.tab_view.grid(row=3, column=0, padx=20, pady=(10, 20), sticky="nsew")
 
         # Add summary and original text tabs
@@ -261,6 +275,17 @@ class SummarizationApp(ctk.CTk):
         )
         status_text.pack(side=tk.RIGHT, padx=10)
 
+        # Cache statistics
+        self.cache_label = ctk.CTkLabel(
+            status_bar,
+            text="",
+            font=ctk.CTkFont(size=12),
+            text_color="gray"
+        )
+        self.cache_label.pack(side=tk.LEFT, padx=10)
+        # Started from the main loop, which the worker thread needs to hand its result back
+        self.after(0, self.update_cache_stats)
+
         # Progress indicator
         self.progress_bar = ctk.CTkProgressBar(self)
         self.progress_bar.grid(row=5, column=0, padx=20, pady=(0, 20), sticky="ew")
@@ -279,6 +304,8 @@ class SummarizationApp(ctk.CTk):
 
         if file_path:
             self.file_path = file_path
+            self.raw_text = None
+            self._original_loaded = False
             filename = os.path.basename(file_path)
             self.file_label.configure(text=f"Selected: {filename}")
 
@@ -290,20 +317,59 @@ class SummarizationApp(ctk.CTk):
             self.export_button.configure(state="disabled")
 
             # Update status
-            self.status_label.configure(text="File loaded")
+            self.status_label.configure(text="Loading file...")
 
-            # Load original text
-            try:
-                raw_text = extract_text(file_path)
-                self.original_text.insert("0.0", raw_text)
-                # Show a small preview of the original text
-                preview = raw_text[:500] + "..." if len(raw_text) > 500 else raw_text
-                self.summary_text.insert("0.0", f"Original text preview:\n{preview}\n\nClick 'Start Summarizing' to generate summary.")
-
-                # Activate progress bar animation
-                self.animate_progress(0, 0.3, 10)
-            except Exception as e:
-                self.show_error(f"Error loading file: {str(e)}")
+            # Disable buttons until the file has been loaded
+            self.summarize_button.configure(state="disabled")
+            self.browse_button.configure(state="disabled")
+
+            # Load original text in a separate thread so the window stays responsive
+            threading.Thread(target=self._do_load, args=(file_path,), daemon=True).start()
+
+    def _do_load(self, file_path):
+        """Extract the file's text in background thread"""
+        try:
+            raw_text = extract_text(file_path)
+            self.update_ui(lambda: self._apply_loaded_text(raw_text))
+        except Exception as e:
+            message = f"Error loading file: {str(e)}"
+            self.update_ui(lambda: self.show_error(message))
+        finally:
+            self.update_ui(self.restore_ui_state)
+
+    def _apply_loaded_text(self, raw_text):
+        """Show the loaded text in main thread"""
+        self.raw_text = raw_text
+        # The original text is only inserted once its tab is opened
+        if self.tab_view.get() == "Original Text":
+            self._fill_original_text()
+        # Show a small preview of the original text
+        preview = raw_text[:500] + "..." if len(raw_text) > 500 else raw_text
+        self.summary_text.insert("0.0", f"Original text preview:\n{preview}\n\nClick 'Start Summarizing' to generate summary.")
+
+        # Update status
+        self.status_label.configure(text="File loaded")
+
+        # Activate progress bar animation
+        self.animate_progress(0, 0.3, 10)
+
+    def _on_tab_changed(self):
+        """Fill the original text box the first time its tab is shown"""
+        if self.tab_view.get() == "Original Text":
+            self._fill_original_text()
+
+    def _fill_original_text(self):
+        """Insert the loaded text into the original text box once per file"""
+        if self._original_loaded or not self.raw_text:
+            return
+        self._original_loaded = True
+        self.insert_large_text(self.original_text, self.raw_text)
+
+    def insert_large_text(self, widget, text, chunk_size=INSERT_CHUNK_CHARS):
+        """Insert text in blocks so Tk lays out a bounded amount at a time and keeps redrawing"""
+        for i in range(0, len(text), chunk_size):
+            widget.insert(tk.END, text[i:i + chunk_size])
+            self.update_idletasks()
 
     def start_summarization(self):
         """Start the summarization process"""
@@ -330,23 +396,39 @@ class SummarizationApp(ctk.CTk):
         threading.Thread(target=self.run_summarization, daemon=True).start()
 
     def animate_progress(self, start_val, end_val, duration, step=0.01, repeat=False):
-        """Animate progress bar display"""
+        """Animate progress bar display, moving by `step` every `duration` seconds"""
+        self._anim_state = {
+            "start": start_val,
+            "end": end_val,
+            "t0": time.monotonic(),
+            "dur": duration * (end_val - start_val) / step,
+            "repeat": repeat,
+        }
+        self.progress_bar.set(start_val)
+        # A single timer drives every animation; only schedule it if it is not already running
+        if self._anim_job is None:
+            self._anim_job = self.after(ANIMATION_INTERVAL_MS, self._tick)
+
+    def stop_progress_animation(self):
+        """Stop the running progress bar animation, leaving the bar where it is"""
+        self._anim_state = None
+
+    def _tick(self):
+        """Set the progress bar from the elapsed time since the animation started"""
+        self._anim_job = None
+        state = self._anim_state
+        if state is None or not self.winfo_exists():
+            return
 
-        def update_progress(current):
-            if not self.winfo_exists():
+        frac = (time.monotonic() - state["t0"]) / state["dur"] if state["dur"] > 0 else 1.0
+        if frac >= 1.0:
+            if not state["repeat"]:
+                self.progress_bar.set(state["end"])
+                self._anim_state = None
                 return
-
-            if current <= end_val:
-                self.progress_bar.set(current)
-                increment = step
-                self.after(int(duration * 1000),
-                           lambda: update_progress(current + increment))
-            elif repeat:
-                self.progress_bar.set(start_val)
-                self.after(int(duration * 1000),
-                           lambda: update_progress(start_val + step))
-
-        update_progress(start_val)
+            frac %= 1.0
+        self.progress_bar.set(state["start"] + frac * (state["end"] - state["start"]))
+        self._anim_job = self.after(ANIMATION_INTERVAL_MS, self._tick)
 
     def run_summarization(self):
         """Run summarization process in background thread"""
@@ -354,22 +436,27 @@ class SummarizationApp(ctk.CTk):
             # Get model name
             model = self.model_var.get()
 
-            # Get original text
-            raw_text = extract_text(self.file_path)
+            # Get original text, reusing what browse_file already extracted
+            raw_text = self.raw_text or extract_text(self.file_path)
 
-            # Define update callback function
-            def update_status(msg):
-                self.update_ui(lambda: self.summary_text.insert(tk.END, f"\n{msg}"))
+            # Define update callback function: summary text is streamed into the
+            # summary box, progress messages go to the status label
+            def update_status(msg, append=False):
+                if append:
+                    self.update_ui(lambda: self.summary_text.insert(tk.END, msg))
+                else:
+                    self.update_ui(lambda: self.status_label.configure(text=msg))
 
             # Run summarization
-            summary = summarize(raw_text, model, update_callback=update_status)
+            summary = run_async(summarize(raw_text, model, update_callback=update_status))
             self.summary_result = summary
 
             # Update UI
             self.update_ui(lambda: self.update_summary_result(summary))
 
         except Exception as e:
-            self.update_ui(lambda: self.show_error(f"Error generating summary: {str(e)}"))
+            message = f"Error generating summary: {str(e)}"
+            self.update_ui(lambda: self.show_error(message))
         finally:
             # Restore UI state
             self.update_ui(self.restore_ui_state)
@@ -390,14 +477,29 @@ class SummarizationApp(ctk.CTk):
 
         # Update status
         self.status_label.configure(text="Summary completed")
+        self.update_cache_stats()
 
         # Switch to summary tab
         self.tab_view.set("Summary Results")
 
         # Complete progress bar
+        self.stop_progress_animation()
         self.progress_bar.set(1.0)
         self.after(1000, lambda: self.progress_bar.set(0))
 
+    def update_cache_stats(self):
+        """Show where chunk summaries came from in the status bar"""
+        # The semantic cache's size is read from its database, so not on the main thread
+        threading.Thread(target=self._load_cache_stats, daemon=True).start()
+
+    def _load_cache_stats(self):
+        entries = semantic_cache.stats()["entries"]
+        text = (
+            f"Cache: {chunk_sources['exact']} exact + {chunk_sources['semantic']} semantic hits / "
+            f"{chunk_sources['llm']} generated ({entries} entries)"
+        )
+        self.update_ui(lambda: self.cache_label.configure(text=text))
+
     def restore_ui_state(self):
         """Restore UI state"""
         self.summarize_button.configure(state="normal")
@@ -487,6 +589,7 @@ class SummarizationApp(ctk.CTk):
             option_1="OK"
         )
         self.status_label.configure(text="Error occurred")
+        self.stop_progress_animation()
 
 
 # Main program entry
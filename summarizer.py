@@ -0,0 +1,596 @@
+# summarizer.py
+"""
+Text extraction, chunking, caching and the Ollama summarization pipeline,
+shared by the GUI (gui.py) and the command line tool (summarization .py).
+"""
+
+import os
+import asyncio
+import collections
+import contextlib
+import functools
+import hashlib
+import itertools
+import json
+import sqlite3
+import threading
+import zipfile
+import xml.etree.ElementTree as ET
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import AsyncIterator, Callable, Iterator, List, Optional, Tuple
+import diskcache
+import numpy as np
+import pdfplumber
+import pymupdf
+import tiktoken
+import httpx
+
+# PDFs with fewer pages than this are extracted in-process. PyMuPDF takes ~4 ms per page while
+# starting the workers takes ~0.5 s with the spawn start method (Windows/macOS), so only
+# documents of several hundred pages gain from the pool
+PDF_PARALLEL_MIN_PAGES = 300
+PDF_MAX_WORKERS = 4
+
+# WordprocessingML namespace used in word/document.xml
+W_NS = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+
+OLLAMA_HOST = os.environ.get("OLLAMA_HOST", "http://localhost:11434")
+# Number of chunks sent to Ollama at once; should match the server's OLLAMA_NUM_PARALLEL
+MAX_PARALLEL = int(os.environ.get("OLLAMA_NUM_PARALLEL", "4"))
+# How long Ollama keeps the model loaded after the last request
+MODEL_KEEP_ALIVE = "30m"
+
+# Context window requested from Ollama for each model; chunks are sized to fit it
+MODEL_CTX = {
+    "deepseek-r1:14b": 8192,
+    "llama2:7b": 4096,
+    "mistral:7b": 8192,
+    "mixtral:8x7b": 8192,
+}
+DEFAULT_NUM_CTX = 4096
+# Share of the context window used for input; the rest is left for the generated summary
+CTX_INPUT_FRACTION = 0.8
+# Share of the input kept free because token counts are estimates: cl100k_base (or the offline
+# character estimate) yields fewer tokens than models with smaller vocabularies, such as llama2
+TOKEN_COUNT_MARGIN = 0.15
+SUMMARY_INSTRUCTION = "Please extract the key points of this passage in English and output a concise summary."
+REDUCE_INSTRUCTION = (
+    "The passage consists of summaries of consecutive parts of one document. Please synthesize them "
+    "in English into a single coherent summary, merging overlapping points."
+)
+
+CACHE_DIR = Path.home() / ".cache" / "summarizer"
+EMBED_MODEL = "nomic-embed-text"
+# Texts per /api/embed request
+EMBED_BATCH_SIZE = 32
+# Prepared chunks waiting for an LLM slot
+PIPELINE_DEPTH = 2
+# Chunks whose embeddings have at least this cosine similarity share a cached summary
+SIMILARITY_THRESHOLD = 0.9
+# Per model; the oldest entries are dropped beyond this, which bounds memory and lookup time
+SEMANTIC_CACHE_MAX_ENTRIES = 5000
+
+
+# —— 1. Text extraction —— #
+def extract_text(file_path: str) -> str:
+    """Automatically call the appropriate extraction function based on file extension"""
+    if file_path.lower().endswith(".pdf"):
+        return extract_text_from_pdf(file_path)
+    if file_path.lower().endswith(".docx"):
+        return extract_text_from_docx(file_path)
+    # Default to plain text
+    with open(file_path, encoding="utf-8") as f:
+        return f.read()
+
+
+def _extract_page_range(pdf_path: str, start: int, end: int) -> List[str]:
+    """Extract pages [start, end) in a worker process, which opens its own copy of the PDF."""
+    with pymupdf.open(pdf_path) as doc:
+        return [doc[i].get_text("text") for i in range(start, end)]
+
+
+def _extract_pdf_with_pdfplumber(pdf_path: str) -> str:
+    with pdfplumber.open(pdf_path) as pdf:
+        return "\n".join(page.extract_text() or "" for page in pdf.pages)
+
+
+def extract_text_from_pdf(pdf_path: str) -> str:
+    workers = min(os.cpu_count() or 1, PDF_MAX_WORKERS)
+    with pymupdf.open(pdf_path) as doc:
+        n = doc.page_count
+        # Small files, or a single CPU, are not worth the cost of starting worker processes
+        in_process = n < PDF_PARALLEL_MIN_PAGES or workers < 2
+        pages = [page.get_text("text") for page in doc] if in_process else None
+
+    if pages is None:
+        # Give each worker one contiguous page range; PyMuPDF documents must not be shared across threads
+        step = -(-n // workers)
+        starts = list(range(0, n, step))
+        ends = [min(s + step, n) for s in starts]
+        with ProcessPoolExecutor(max_workers=len(starts)) as pool:
+            results = pool.map(_extract_page_range, [pdf_path] * len(starts), starts, ends)
+            pages = list(itertools.chain.from_iterable(results))
+
+    text = "\n".join(pages)
+    # PyMuPDF found no text at all; give pdfplumber's layout analysis a try before giving up
+    if not text.strip():
+        return _extract_pdf_with_pdfplumber(pdf_path)
+    return text
+
+
+def _docx_paragraph_text(paragraph: ET.Element) -> str:
+    """Text of a <w:p> element, with tabs and line breaks rendered like python-docx does"""
+    parts = []
+    for run in paragraph.iter(W_NS + "r"):
+        for child in run:
+            if child.tag == W_NS + "t":
+                parts.append(child.text or "")
+            elif child.tag == W_NS + "tab":
+                parts.append("\t")
+            elif child.tag in (W_NS + "br", W_NS + "cr"):
+                parts.append("\n")
+    return "".join(parts)
+
+
+def _iter_docx_paragraphs(docx_path: str) -> Iterator[str]:
+    """Yield the non-blank paragraphs of a .docx, streaming word/document.xml instead of loading it whole"""
+    with zipfile.ZipFile(docx_path) as z, z.open("word/document.xml") as f:
+        for _, elem in ET.iterparse(f, events=("end",)):
+            if elem.tag == W_NS + "p":
+                text = _docx_paragraph_text(elem)
+                if text.strip():
+                    yield text
+                elem.clear()
+
+
+def extract_text_from_docx(docx_path: str) -> str:
+    return "\n".join(_iter_docx_paragraphs(docx_path))
+
+
+# —— 2. Text chunking —— #
+def pack_ranges(lens: np.ndarray, limit: int) -> List[Tuple[int, int]]:
+    """Greedily group consecutive items into [start, end) ranges whose total length stays within limit"""
+    # cum[i] is the total length of items[:i], so each boundary is found with a binary search
+    cum = np.concatenate(([0], np.cumsum(lens)))
+    ranges: List[Tuple[int, int]] = []
+    start = 0
+    while start < len(lens):
+        end = int(np.searchsorted(cum, cum[start] + limit, side="right")) - 1
+        # An item longer than limit still forms a range of its own
+        end = max(end, start + 1)
+        ranges.append((start, end))
+        start = end
+    return ranges
+
+
+@functools.lru_cache(maxsize=None)
+def _get_encoding():
+    """
+    Load the tokenizer on first use; it approximates the models' own tokenizers closely enough
+    for sizing chunks. tiktoken downloads it on first use, so None is returned when offline.
+    """
+    try:
+        return tiktoken.get_encoding("cl100k_base")
+    except Exception:
+        return None
+
+
+def count_tokens(texts: List[str]) -> np.ndarray:
+    """Token count of each text, encoded in one batch"""
+    encoding = _get_encoding()
+    if encoding is None:
+        # Roughly four characters per token in English text, rounded up so short lines still count
+        counts = (-(-len(text) // 4) for text in texts)
+    else:
+        counts = (len(tokens) for tokens in encoding.encode_ordinary_batch(texts))
+    return np.fromiter(counts, dtype=np.int64, count=len(texts))
+
+
+def context_size(model: str) -> int:
+    return MODEL_CTX.get(model, DEFAULT_NUM_CTX)
+
+
+def chunk_token_budget(model: str, instruction: str = SUMMARY_INSTRUCTION) -> int:
+    """Tokens of text that fit in one request to `model` next to the instruction"""
+    budget = int(CTX_INPUT_FRACTION * (1 - TOKEN_COUNT_MARGIN) * context_size(model))
+    return budget - int(count_tokens([instruction])[0])
+
+
+def chunk_text(text: str, max_tokens: Optional[int] = None) -> List[str]:
+    """Split long text into chunks of at most max_tokens tokens to avoid prompt words that are too long"""
+    paras = text.split("\n")
+    if max_tokens is None:
+        max_tokens = int(CTX_INPUT_FRACTION * (1 - TOKEN_COUNT_MARGIN) * DEFAULT_NUM_CTX)
+    # Each paragraph is encoded once; packing then works on the token counts alone.
+    # The extra token per paragraph is for the "\n" that joins it to the next one
+    lens = count_tokens(paras) + 1
+    return ["\n".join(paras[start:end]) for start, end in pack_ranges(lens, max_tokens)]
+
+
+# —— 3. Caches of chunk summaries —— #
+def _unit_vector(embedding) -> np.ndarray:
+    vector = np.asarray(embedding, dtype=np.float32)
+    norm = np.linalg.norm(vector)
+    return vector / norm if norm else vector
+
+
+class SemanticCache:
+    """
+    Reuse the summary of an earlier chunk whose embedding is close enough to the new one.
+    Entries are namespaced by model and persisted in SQLite so they survive restarts.
+    """
+
+    def __init__(self, path: Path, threshold: float = SIMILARITY_THRESHOLD,
+                 max_entries: int = SEMANTIC_CACHE_MAX_ENTRIES):
+        self.path = path
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._vectors = {}    # model -> unit vectors, oldest first
+        self._responses = {}  # model -> summaries, aligned with _vectors
+        self._matrices = {}   # model -> _vectors stacked into a matrix, rebuilt after changes
+        self._loaded = False
+
+    def _connect(self) -> sqlite3.Connection:
+        # One connection for the cache's lifetime; _lock serializes its use across threads
+        if self._conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(self.path, check_same_thread=False)
+            self._conn.execute("CREATE TABLE IF NOT EXISTS entries (model TEXT, embedding BLOB, response TEXT)")
+        return self._conn
+
+    def _load(self):
+        if self._loaded:
+            return
+        self._loaded = True
+        rows = self._connect().execute("SELECT model, embedding, response FROM entries ORDER BY rowid").fetchall()
+        for model, blob, response in rows:
+            self._add(model, np.frombuffer(blob, dtype=np.float32), response)
+
+    def _add(self, model: str, vector: np.ndarray, response: str) -> bool:
+        """Add an entry in memory; returns True if older entries were dropped"""
+        vectors = self._vectors.setdefault(model, [])
+        responses = self._responses.setdefault(model, [])
+        dropped = False
+        if vectors and vectors[0].shape != vector.shape:
+            # The embedding model has changed; its old vectors can never match new ones
+            vectors.clear()
+            responses.clear()
+            dropped = True
+        vectors.append(vector)
+        responses.append(response)
+        self._matrices.pop(model, None)
+        if len(vectors) <= self.max_entries:
+            return dropped
+        del vectors[0], responses[0]
+        return True
+
+    def _matrix(self, model: str) -> Optional[np.ndarray]:
+        if model not in self._matrices and self._vectors.get(model):
+            self._matrices[model] = np.stack(self._vectors[model])
+        return self._matrices.get(model)
+
+    def lookup(self, model: str, embedding) -> Optional[str]:
+        query = _unit_vector(embedding)
+        with self._lock:
+            self._load()
+            vectors = self._matrix(model)
+            # Rows are unit vectors, so the dot product is the cosine similarity
+            if vectors is not None and vectors.shape[1] == query.shape[0]:
+                scores = vectors @ query
+                best = int(np.argmax(scores))
+                if scores[best] >= self.threshold:
+                    self.hits += 1
+                    return self._responses[model][best]
+            self.misses += 1
+            return None
+
+    def store(self, model: str, embedding, response: str):
+        vector = _unit_vector(embedding)
+        with self._lock:
+            self._load()
+            dropped = self._add(model, vector, response)
+            blob = vector.tobytes()
+            conn = self._connect()
+            with conn:
+                conn.execute(
+                    "INSERT INTO entries (model, embedding, response) VALUES (?, ?, ?)",
+                    (model, blob, response)
+                )
+                if dropped:
+                    conn.execute(
+                        "DELETE FROM entries WHERE model = ? AND length(embedding) != ?",
+                        (model, len(blob))
+                    )
+                    conn.execute(
+                        "DELETE FROM entries WHERE model = ? AND rowid NOT IN "
+                        "(SELECT rowid FROM entries WHERE model = ? ORDER BY rowid DESC LIMIT ?)",
+                        (model, model, self.max_entries)
+                    )
+
+    def stats(self) -> dict:
+        with self._lock:
+            if self._loaded:
+                entries = sum(len(r) for r in self._responses.values())
+            else:
+                # Counted in SQLite rather than loading every vector just for this
+                entries = self._connect().execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+            return {"hits": self.hits, "misses": self.misses, "entries": entries}
+
+
+semantic_cache = SemanticCache(CACHE_DIR / "semantic.sqlite3")
+# Exact-match cache keyed by hash(model + chunk); chunking is deterministic, so unchanged text reuses its summary
+chunk_cache = diskcache.Cache(str(CACHE_DIR / "chunks"))
+# Where chunk summaries came from since start-up: "exact" and "semantic" cache hits, or "llm"
+chunk_sources = collections.Counter()
+# One client, and so one keep-alive connection pool, for every request to the Ollama server
+_client = httpx.AsyncClient(base_url=OLLAMA_HOST, timeout=None)
+
+
+# —— 4. Summarize with the Ollama server —— #
+async def warm_up_model(model: str) -> bool:
+    """Load the model into memory ahead of the first request; an empty prompt only loads it"""
+    try:
+        response = await _client.post(
+            "/api/generate",
+            # Same num_ctx as the summary requests, otherwise Ollama reloads the model for them
+            json={"model": model, "prompt": "", "options": {"num_ctx": context_size(model)}, "keep_alive": MODEL_KEEP_ALIVE},
+            timeout=300
+        )
+        return response.is_success
+    except httpx.HTTPError:
+        # Best effort: the real request reports the error if the server is unreachable
+        return False
+
+
+async def stream_summarize(text: str, model: str, instruction: str = SUMMARY_INSTRUCTION) -> AsyncIterator[str]:
+    """Yield the summary of a passage piece by piece as the model generates it"""
+    # The instruction goes in the system field rather than the prompt: it then forms an identical
+    # prefix on every call, which Ollama can reuse from its KV cache while the model stays loaded
+    payload = {
+        "model": model,
+        "system": instruction,
+        "prompt": text,
+        "options": {"num_ctx": context_size(model)},
+        "keep_alive": MODEL_KEEP_ALIVE,
+        "stream": True,
+    }
+    # The response is one JSON object per line
+    async with _client.stream("POST", "/api/generate", json=payload) as response:
+        if response.is_error:
+            # Ollama explains the failure in the body, e.g. that the model has not been pulled yet
+            await response.aread()
+            try:
+                message = response.json()["error"]
+            except (ValueError, KeyError, TypeError):
+                response.raise_for_status()
+            raise RuntimeError(f"Ollama error: {message}")
+        async for line in response.aiter_lines():
+            if not line:
+                continue
+            part = json.loads(line)
+            if "error" in part:
+                raise RuntimeError(f"Ollama error: {part['error']}")
+            yield part.get("response", "")
+
+
+async def summarize_with_ollama(text: str, model: str, semaphore: Optional[asyncio.Semaphore] = None,
+                               on_token: Optional[Callable[[str], None]] = None,
+                               instruction: str = SUMMARY_INSTRUCTION) -> str:
+    parts = []
+    # The shared semaphore caps in-flight requests so we do not oversubscribe the server's slots
+    async with semaphore or contextlib.nullcontext():
+        async for token in stream_summarize(text, model, instruction):
+            parts.append(token)
+            if on_token:
+                on_token(token)
+    return "".join(parts).strip()
+
+
+async def embed_texts(texts: List[str]) -> List[List[float]]:
+    """Embed texts with one /api/embed request per batch instead of one request per text"""
+    embeddings: List[List[float]] = []
+    for start in range(0, len(texts), EMBED_BATCH_SIZE):
+        response = await _client.post(
+            "/api/embed",
+            json={"model": EMBED_MODEL, "input": texts[start:start + EMBED_BATCH_SIZE]},
+            timeout=60
+        )
+        response.raise_for_status()
+        embeddings.extend(response.json()["embeddings"])
+    return embeddings
+
+
+def _chunk_cache_key(text: str, model: str) -> str:
+    return hashlib.blake2b((model + text).encode("utf-8"), digest_size=16).hexdigest()
+
+
+class OrderedStream:
+    """
+    Forward the output of concurrently generated chunks in chunk order.
+    The earliest unfinished chunk is forwarded live; later chunks are buffered until it finishes.
+    """
+
+    def __init__(self, count: int, emit: Callable[[str], None], separator: str = "\n\n"):
+        self.emit = emit
+        self.separator = separator
+        self.buffers: List[List[str]] = [[] for _ in range(count)]
+        self.finished = [False] * count
+        self.current = 0
+
+    def write(self, idx: int, token: str):
+        if idx == self.current:
+            self.emit(token)
+        else:
+            self.buffers[idx].append(token)
+
+    def finish(self, idx: int):
+        self.finished[idx] = True
+        while self.current < len(self.finished) and self.finished[self.current]:
+            self.current += 1
+            if self.current < len(self.finished):
+                self.emit(self.separator + "".join(self.buffers[self.current]))
+                self.buffers[self.current] = []
+
+
+async def lookup_chunks(chunks: List[str], model: str, first_batch: int = EMBED_BATCH_SIZE
+                        ) -> AsyncIterator[Tuple[int, Optional[str], Optional[List[float]]]]:
+    """
+    Prepare chunks for summarization in batches: yields (idx, cached summary, None) for exact cache
+    hits and (idx, None, embedding) for the rest, or (idx, None, None) if the embedding request failed.
+    Hits are yielded before their batch is embedded, and the first batch is small so the first
+    LLM calls need not wait for a full batch of embeddings.
+    """
+    start, size = 0, first_batch
+    while start < len(chunks):
+        batch = chunks[start:start + size]
+        # The disk cache blocks, so it is read in a worker thread
+        cached = await asyncio.to_thread(lambda: [chunk_cache.get(_chunk_cache_key(chunk, model)) for chunk in batch])
+        missing = []
+        for offset, summary in enumerate(cached):
+            if summary is None:
+                missing.append(offset)
+            else:
+                yield start + offset, summary, None
+        try:
+            embeddings = await embed_texts([batch[offset] for offset in missing])
+        except httpx.HTTPError:
+            # Best effort: without the embedding model the chunks skip the semantic cache
+            embeddings = [None] * len(missing)
+        for offset, embedding in zip(missing, embeddings):
+            yield start + offset, None, embedding
+        start, size = start + size, EMBED_BATCH_SIZE
+
+
+async def summarize_chunk(text: str, model: str, embedding: Optional[List[float]],
+                          on_token: Optional[Callable[[str], None]] = None) -> str:
+    """Summarize a chunk that missed the exact cache, trying the semantic cache before the LLM"""
+    # Both caches do blocking disk I/O, so they are used from worker threads
+    summary = None
+    if embedding is not None:
+        summary = await asyncio.to_thread(semantic_cache.lookup, model, embedding)
+    chunk_sources["llm" if summary is None else "semantic"] += 1
+    if summary is None:
+        summary = await summarize_with_ollama(text, model, on_token=on_token)
+        if embedding is not None:
+            await asyncio.to_thread(semantic_cache.store, model, embedding, summary)
+    elif on_token:
+        on_token(summary)
+    await asyncio.to_thread(chunk_cache.set, _chunk_cache_key(text, model), summary)
+    return summary
+
+
+async def reduce_summaries(summaries: List[str], model: str, semaphore: Optional[asyncio.Semaphore] = None,
+                           update_callback=None) -> str:
+    """
+    Merge block summaries into one, level by level. Each call gets at most one chunk's worth of
+    summaries, so long documents form a tree whose depth grows with the number of chunks.
+    """
+    budget = chunk_token_budget(model, REDUCE_INSTRUCTION)
+    level = 1
+    while len(summaries) > 1:
+        # Plus one token per summary for the "\n\n" that joins it to the next one
+        groups = [summaries[start:end] for start, end in pack_ranges(count_tokens(summaries) + 1, budget)]
+        if len(groups) == len(summaries):
+            # Every summary fills a chunk on its own; merge them pairwise so the tree still shrinks
+            groups = [summaries[i:i + 2] for i in range(0, len(summaries), 2)]
+        if update_callback:
+            update_callback(f"Combining {len(summaries)} summaries into {len(groups)} (level {level})")
+
+        async def combine(group: List[str]) -> str:
+            if len(group) == 1:
+                return group[0]
+            text = "\n\n".join(group)
+            # Merges are cached like chunks, keyed apart from them by the instruction
+            key = _chunk_cache_key(text, model + REDUCE_INSTRUCTION)
+            summary = await asyncio.to_thread(chunk_cache.get, key)
+            if summary is None:
+                summary = await summarize_with_ollama(text, model, semaphore, instruction=REDUCE_INSTRUCTION)
+                await asyncio.to_thread(chunk_cache.set, key, summary)
+            return summary
+
+        summaries = await asyncio.gather(*(combine(group) for group in groups))
+        level += 1
+    return summaries[0] if summaries else ""
+
+
+async def summarize(text: str, model: str, update_callback=None,
+                    max_parallel: int = MAX_PARALLEL) -> str:
+    """
+    Summarize all chunks concurrently. With an update_callback, summary text is streamed as
+    update_callback(token, append=True) in document order and progress as update_callback(msg).
+    """
+    chunks = chunk_text(text, chunk_token_budget(model))
+    summaries: List[Optional[str]] = [None] * len(chunks)
+    stream = OrderedStream(len(chunks), lambda token: update_callback(token, append=True)) if update_callback else None
+    if update_callback:
+        update_callback(f"Summarizing {len(chunks)} parts")
+
+    # Cache lookups and embeddings (producer) overlap with LLM calls (consumer); the bounded
+    # queue keeps the producer only a little ahead of the free LLM slots
+    queue: asyncio.Queue = asyncio.Queue(maxsize=PIPELINE_DEPTH)
+    semaphore = asyncio.Semaphore(max_parallel)
+    done = 0
+
+    async def produce():
+        try:
+            # A first batch the size of the LLM slots gets them all busy after one small embed request
+            async for item in lookup_chunks(chunks, model, first_batch=max_parallel):
+                await queue.put(item)
+        except Exception:
+            # Wake the consumer so the error is raised from awaiting the producer
+            await queue.put(None)
+            raise
+        await queue.put(None)
+
+    def finish(idx: int, summary: str):
+        nonlocal done
+        summaries[idx] = summary
+        done += 1
+        if stream:
+            stream.finish(idx)
+            update_callback(f"Summarized part {done}/{len(chunks)}")
+
+    async def run(idx: int, embedding: Optional[List[float]]):
+        try:
+            on_token = (lambda token: stream.write(idx, token)) if stream else None
+            finish(idx, await summarize_chunk(chunks[idx], model, embedding, on_token))
+        finally:
+            semaphore.release()
+
+    producer = asyncio.create_task(produce())
+    tasks: List[asyncio.Task] = []
+    try:
+        while (item := await queue.get()) is not None:
+            idx, cached, embedding = item
+            if cached is not None:
+                chunk_sources["exact"] += 1
+                if stream:
+                    stream.write(idx, cached)
+                finish(idx, cached)
+                continue
+            # Only take the next item once an LLM slot is free, so the queue applies back-pressure
+            await semaphore.acquire()
+            # One failed chunk fails the summary, so no further requests are started after it
+            failed = next((task for task in tasks if task.done() and task.exception()), None)
+            if failed:
+                await failed
+            tasks.append(asyncio.create_task(run(idx, embedding)))
+        await producer
+        await asyncio.gather(*tasks)
+    finally:
+        # After a failure, stop the remaining work instead of letting it stream tokens and
+        # write caches in the background
+        for task in [producer, *tasks]:
+            task.cancel()
+        await asyncio.gather(producer, *tasks, return_exceptions=True)
+    return await reduce_summaries(summaries, model, semaphore, update_callback)
+
+
+async def close_client():
+    """Close the shared client; call it on the event loop that made the requests"""
+    await _client.aclose()